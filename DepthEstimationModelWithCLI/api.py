@@ -1,32 +1,121 @@
+import asyncio
+import hashlib
 import os
-import uuid
-from typing import Dict
-
-from fastapi import FastAPI, File, HTTPException, UploadFile
-from fastapi.responses import FileResponse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, Literal, Optional
+
+from dotenv import load_dotenv
+from fastapi import BackgroundTasks, FastAPI, File, HTTPException, Request, UploadFile
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
+from PIL import Image
 
-from predictor import DepthEstimationModel
+from predictor import DepthEstimationModel, raw_output_path
 from upload import upload_image
 
-app = FastAPI(title="Depth Estimation API", version="1.0.0")
+load_dotenv()
+
+# ImgBB yüklemesi isteğe bağlıdır (IMG_API_KEY gerektirir)
+ENABLE_IMGBB = os.getenv("ENABLE_IMGBB", "0").lower() in ("1", "true", "yes")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Modeli ve toplu çıkarım görevini her işçi süreci için bir kez başlat"""
+    # Bloklayan çıkarım ve görüntü işlemleri sınırlı bir iş parçacığı havuzunda
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=INFERENCE_THREADS)
+    )
+
+    try:
+        app.state.model = DepthEstimationModel(
+            compile_model=True, max_batch_size=MAX_BATCH_SIZE
+        )
+        print("Depth estimation model loaded successfully")
+    except Exception as e:
+        print(f"Failed to load depth estimation model: {e}")
+        app.state.model = None
+
+    worker = None
+    if app.state.model is not None:
+        worker = asyncio.create_task(batch_worker(app.state.model))
+
+    yield
+
+    if worker is not None:
+        worker.cancel()
+
 
-try:
-    depth_estimator = DepthEstimationModel()
-    print("Depth estimation model loaded successfully")
-except Exception as e:
-    print(f"Failed to load depth estimation model: {e}")
-    depth_estimator = None
+app = FastAPI(title="Depth Estimation API", version="1.0.0", lifespan=lifespan)
 
-TEMP_FOLDER = "uploads"
 OUTPUT_FOLDER = "outputs"
-os.makedirs(TEMP_FOLDER, exist_ok=True)
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
-app.mount("/outputs", StaticFiles(directory=OUTPUT_FOLDER), name="outputs")
+# Çıktı adları içerik özetinden türetildiği için dosyalar hiç değişmez
+IMMUTABLE_CACHE_CONTROL = "public, max-age=86400, immutable"
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """Sunulan çıktı dosyalarına uzun süreli önbellek başlığı ekle"""
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+app.mount("/outputs", ImmutableStaticFiles(directory=OUTPUT_FOLDER), name="outputs")
 
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tiff"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 64 * 1024  # 64KB
+
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "8"))
+BATCH_TIMEOUT = float(os.getenv("BATCH_TIMEOUT_MS", "8")) / 1000
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", "4"))
+
+# Aynı anda işlenen ve sırada bekleyen tahmin sayısı sınırları
+GPU_INFLIGHT = int(os.getenv("GPU_INFLIGHT", "16"))
+MAX_QUEUED_PREDICTIONS = int(os.getenv("MAX_QUEUED_PREDICTIONS", "16"))
+RETRY_AFTER_SECONDS = 5
+
+# Bağlantı sınırı tahmin sınırlarının üstünde kalmalı; aksi halde Uvicorn
+# istekleri 503 ile reddedeceğimiz noktaya gelmeden keser. Aradaki pay
+# indirme ve sağlık kontrolü istekleri için ayrılır.
+CONNECTION_HEADROOM = 16
+LIMIT_CONCURRENCY = int(
+    os.getenv(
+        "LIMIT_CONCURRENCY",
+        str(GPU_INFLIGHT + MAX_QUEUED_PREDICTIONS + CONNECTION_HEADROOM),
+    )
+)
+
+gpu_semaphore = asyncio.Semaphore(GPU_INFLIGHT)
+queued_predictions = 0
+
+inference_queue: asyncio.Queue = asyncio.Queue()
+
+# Dosya sistemi çağrıları (stat/silme) görüntü işleme havuzunun arkasında
+# beklemesin diye ayrı küçük bir havuzda çalışır
+fs_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="fs")
+
+# file_id -> şu anda üretilmekte olan çıktıların tamamlanma future'ı
+pending_outputs: Dict[str, asyncio.Future] = {}
+
+# file_id -> ImgBB yükleme durumu ("pending", "completed", "failed"); işçi
+# sürecine özeldir ve en eski kayıtlar atılarak sınırlı tutulur
+MAX_IMGBB_RECORDS = int(os.getenv("MAX_IMGBB_RECORDS", "1024"))
+imgbb_uploads: "OrderedDict[str, Dict]" = OrderedDict()
+
+
+def record_imgbb_upload(file_id: str, record: Dict):
+    """Yükleme durumunu kaydet, sınır aşılırsa en eski kaydı at"""
+    imgbb_uploads[file_id] = record
+    imgbb_uploads.move_to_end(file_id)
+    while len(imgbb_uploads) > MAX_IMGBB_RECORDS:
+        imgbb_uploads.popitem(last=False)
 
 
 def cleanup_file(file_path: str):
@@ -38,38 +127,203 @@ def cleanup_file(file_path: str):
         print(f"Could not delete {file_path}: {e}")
 
 
+@asynccontextmanager
+async def prediction_slot():
+    """Çıkarım için yer ayır, kuyruk çok uzunsa 503 ile geri çevir"""
+    global queued_predictions
+
+    if gpu_semaphore.locked() and queued_predictions >= MAX_QUEUED_PREDICTIONS:
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy, please retry later",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
+
+    queued_predictions += 1
+    try:
+        await gpu_semaphore.acquire()
+    finally:
+        queued_predictions -= 1
+
+    try:
+        yield
+    finally:
+        gpu_semaphore.release()
+
+
+async def wait_for_pending(file_id: str) -> bool:
+    """Aynı çıktı başka bir istekte üretiliyorsa bitmesini bekle"""
+    pending = pending_outputs.get(file_id)
+    if pending is None:
+        return False
+
+    await asyncio.wait([pending])
+    return True
+
+
+async def run_fs(func, *args):
+    """Dosya sistemi çağrısını olay döngüsünü bloklamadan çalıştır"""
+    return await asyncio.get_running_loop().run_in_executor(fs_executor, func, *args)
+
+
+def stat_or_none(path: str) -> Optional[os.stat_result]:
+    """Dosya yoksa None döndüren os.stat"""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+async def output_exists(path: str) -> bool:
+    """Çıktının diskte var olup olmadığını kontrol et"""
+    return await run_fs(stat_or_none, path) is not None
+
+
+async def cached_file_response(
+    request: Request,
+    path: str,
+    etag: str,
+    filename: str,
+    media_type: str,
+    not_found_detail: str,
+) -> Response:
+    """Önbellek başlıklarıyla dosya döndür, istemcideki kopya güncelse 304 ver"""
+    # Tek stat hem varlık kontrolü hem FileResponse için kullanılır
+    stat_result = await run_fs(stat_or_none, path)
+    if stat_result is None:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": f'"{etag}"'}
+
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(
+        path=path,
+        filename=filename,
+        media_type=media_type,
+        headers=headers,
+        stat_result=stat_result,
+    )
+
+
+def cache_hasher(depth_estimator: DepthEstimationModel):
+    """Model kimliğiyle başlatılmış içerik adresli önbellek özeti oluştur"""
+    hasher = hashlib.sha256()
+    hasher.update(depth_estimator.model_id.encode("utf-8"))
+    return hasher
+
+
+async def run_batch(
+    depth_estimator: DepthEstimationModel, group: list, inflight: asyncio.Semaphore
+):
+    """Bir grubu ileri geçişten geçir ve sonuçları bekleyen isteklere dağıt"""
+    try:
+        tensors = [tensor for tensor, _ in group]
+        try:
+            depths = await asyncio.to_thread(depth_estimator.infer_batch, tensors)
+        except Exception as e:
+            print(f"Batch inference failed: {e}")
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for depth, (_, future) in zip(depths, group):
+            if not future.done():
+                future.set_result(depth)
+    finally:
+        inflight.release()
+
+
+async def batch_worker(depth_estimator: DepthEstimationModel):
+    """Kuyruktaki istekleri toplayıp tek ileri geçişte işle"""
+    loop = asyncio.get_running_loop()
+
+    # Bir grup GPU'da işlenirken sonraki grup diğer CUDA akışında kopyalanabilir
+    inflight = asyncio.Semaphore(depth_estimator.max_concurrent_batches)
+    running = set()
+
+    while True:
+        items = [await inference_queue.get()]
+        deadline = loop.time() + BATCH_TIMEOUT
+
+        # Kısa bir pencere boyunca gelen diğer istekleri de topla
+        while len(items) < MAX_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(inference_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # Yalnızca aynı boyuttaki tensörler birlikte işlenebilir
+        groups = {}
+        for tensor, future in items:
+            groups.setdefault(tuple(tensor.shape), []).append((tensor, future))
+
+        for group in groups.values():
+            await inflight.acquire()
+            task = asyncio.create_task(run_batch(depth_estimator, group, inflight))
+            running.add(task)
+            task.add_done_callback(running.discard)
+
+
+async def infer_batched(depth_estimator: DepthEstimationModel, image: Image.Image):
+    """Görüntüyü toplu çıkarım kuyruğuna ekle ve sonucunu bekle"""
+    tensor = await asyncio.to_thread(depth_estimator.preprocess, image)
+    future = asyncio.get_running_loop().create_future()
+    await inference_queue.put((tensor, future))
+    return await future
+
+
+def upload_and_record(output_path: str, file_id: str):
+    """Derinlik haritasını ImgBB'ye yükle ve sonucu kaydet"""
+    try:
+        print("Uploading image to ImgBB...")
+        imgbb_url = upload_image(output_path)
+        record_imgbb_upload(file_id, {"status": "completed", "imgbb_url": imgbb_url})
+        print(f"Image uploaded to ImgBB successfully: {imgbb_url}")
+    except Exception as upload_error:
+        # Upload başarısız olursa, ana işlemi etkilemesin
+        record_imgbb_upload(file_id, {"status": "failed", "error": str(upload_error)})
+        print(f"ImgBB upload failed (not critical): {upload_error}")
+
+
 @app.get("/")
-async def root():
+async def root(request: Request):
     """API durumu"""
     return {
         "message": "Depth Estimation API",
         "status": "running",
-        "model_loaded": depth_estimator is not None,
+        "model_loaded": request.app.state.model is not None,
+        "imgbb_enabled": ENABLE_IMGBB,
     }
 
 
 @app.post("/predict")
-async def predict(file: UploadFile = File(...)) -> Dict:
+async def predict(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    raw: bool = False,
+    precision: Literal["half", "full"] = "half",
+) -> Dict:
     """
     Görüntüden derinlik haritası oluştur
+
+    Ham derinlik verisi (.npz) için raw=true; float32 için precision=full
     """
+    depth_estimator = request.app.state.model
     if depth_estimator is None:
         raise HTTPException(
             status_code=503, detail="Depth estimation model is not available"
         )
 
-    input_path = None
     output_path = None
 
     try:
-        # Dosya boyutu kontrolü
-        file_content = await file.read()
-        if len(file_content) > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File too large. Maximum size is {MAX_FILE_SIZE // (1024*1024)}MB",
-            )
-
         # Dosya uzantısı kontrolü
         file_ext = os.path.splitext(file.filename)[1].lower()
         if file_ext not in ALLOWED_EXTENSIONS:
@@ -78,44 +332,85 @@ async def predict(file: UploadFile = File(...)) -> Dict:
                 detail=f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}",
             )
 
-        # Benzersiz dosya adları oluştur
-        file_id = str(uuid.uuid4())
-        input_filename = f"input_{file_id}{file_ext}"
+        # Dosyayı parça parça oku, boyutu ve özeti aynı geçişte hesapla
+        hasher = cache_hasher(depth_estimator)
+        total_size = 0
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            total_size += len(chunk)
+            if total_size > MAX_FILE_SIZE:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large. Maximum size is {MAX_FILE_SIZE // (1024*1024)}MB",
+                )
+            hasher.update(chunk)
+
+        # Çıktı adları içerik özetinden türetilir
+        file_id = hasher.hexdigest()
         output_filename = f"output_{file_id}.png"
-
-        input_path = os.path.join(TEMP_FOLDER, input_filename)
         output_path = os.path.join(OUTPUT_FOLDER, output_filename)
+        full_precision = precision == "full"
+        raw_path = raw_output_path(output_path, full_precision)
+        raw_filename = os.path.basename(raw_path)
+
+        # Aynı görüntü daha önce işlendiyse (ve istenen çıktılar varsa) çıkarımı atla;
+        # şu anda işleniyorsa önce o işlemin bitmesini bekle
+        while True:
+            cache_hit = await output_exists(output_path) and (
+                not raw or await output_exists(raw_path)
+            )
+            if cache_hit or not await wait_for_pending(file_id):
+                break
 
-        # Dosyayı kaydet
-        with open(input_path, "wb") as f:
-            f.write(file_content)
-
-        # 1. Derinlik haritası oluştur (Ana işlem)
-        print(f"Generating depth map for: {file.filename}")
-        depth_result = depth_estimator.calculate_depthmap(input_path, output_path)
-
-        # Derinlik haritası oluşturulup oluşturulmadığını kontrol et
-        if depth_result is None or not os.path.exists(output_path):
-            raise HTTPException(status_code=500, detail="Depth map generation failed")
-
-        print(f"Depth map generated successfully: {output_path}")
-
-        # 2. İsteğe bağlı: Görüntüyü ImgBB'ye yükle (Yan işlem)
-        imgbb_url = None
-        upload_error_msg = None
-
-        try:
-            print("Uploading image to ImgBB...")
-            imgbb_url = upload_image(output_path)
-            print(f"Image uploaded to ImgBB successfully: {imgbb_url}")
-        except Exception as upload_error:
-            # Upload başarısız olursa, ana işlemi etkilemesin
-            upload_error_msg = str(upload_error)
-            print(f"ImgBB upload failed (not critical): {upload_error_msg}")
-
-        # NPY dosyası varsa onun da yolunu al
-        npy_filename = f"output_{file_id}_raw.npy"
-        npy_path = os.path.join(OUTPUT_FOLDER, npy_filename)
+        if cache_hit:
+            print(f"Cache hit for: {file.filename} ({file_id})")
+        else:
+            # 1. Derinlik haritası oluştur (Ana işlem)
+            print(f"Generating depth map for: {file.filename}")
+            pending = asyncio.get_running_loop().create_future()
+            pending_outputs[file_id] = pending
+            try:
+                async with prediction_slot():
+                    # Yüklenen dosya ayrıca kaydedilmeden doğrudan çözülür
+                    await file.seek(0)
+                    try:
+                        image = await asyncio.to_thread(
+                            depth_estimator.load_image, file.file
+                        )
+                    except (OSError, Image.DecompressionBombError):
+                        # Bozuk ya da görüntü olmayan dosya istemci hatasıdır
+                        # (UnidentifiedImageError da bir OSError'dır)
+                        raise HTTPException(
+                            status_code=400, detail="Invalid image file"
+                        ) from None
+                    depth_numpy = await infer_batched(depth_estimator, image)
+                    depth_result = await asyncio.to_thread(
+                        depth_estimator.save_depthmap,
+                        depth_numpy,
+                        output_path,
+                        raw,
+                        full_precision,
+                    )
+            finally:
+                pending_outputs.pop(file_id, None)
+                pending.set_result(None)
+
+            # Derinlik haritası oluşturulup oluşturulmadığını kontrol et
+            if depth_result is None or not await output_exists(output_path):
+                raise HTTPException(
+                    status_code=500, detail="Depth map generation failed"
+                )
+
+            print(f"Depth map generated successfully: {output_path}")
+
+        # 2. İsteğe bağlı: Görüntüyü arka planda ImgBB'ye yükle (Yan işlem)
+        if ENABLE_IMGBB:
+            upload_record = imgbb_uploads.get(file_id)
+            if upload_record is None or upload_record["status"] == "failed":
+                upload_record = {"status": "pending"}
+                record_imgbb_upload(file_id, upload_record)
+                background_tasks.add_task(upload_and_record, output_path, file_id)
+        else:
+            upload_record = {"status": "disabled"}
 
         # Response oluştur
         response_data = {
@@ -127,23 +422,25 @@ async def predict(file: UploadFile = File(...)) -> Dict:
             "download_url": f"/download/{file_id}",
             "processing_info": {
                 "depth_estimation": "completed",
-                "imgbb_upload": "completed" if imgbb_url else "failed",
+                "cached": cache_hit,
+                "imgbb_upload": upload_record["status"],
             },
         }
 
-        # ImgBB URL'si varsa ekle
-        if imgbb_url:
-            response_data["imgbb_url"] = imgbb_url
+        if ENABLE_IMGBB:
+            response_data["imgbb_status_url"] = f"/imgbb/{file_id}"
+
+        # Önceki bir yüklemeden ImgBB URL'si varsa ekle
+        if upload_record["status"] == "completed":
+            response_data["imgbb_url"] = upload_record["imgbb_url"]
             response_data["external_url_available"] = True
         else:
             response_data["external_url_available"] = False
-            if upload_error_msg:
-                response_data["upload_error"] = upload_error_msg
 
-        # NPY dosyası varsa ekle
-        if os.path.exists(npy_path):
+        # Ham veri dosyası varsa ekle
+        if await output_exists(raw_path):
             response_data["raw_data_available"] = True
-            response_data["raw_data_url"] = f"/outputs/{npy_filename}"
+            response_data["raw_data_url"] = f"/outputs/{raw_filename}"
         else:
             response_data["raw_data_available"] = False
 
@@ -158,46 +455,58 @@ async def predict(file: UploadFile = File(...)) -> Dict:
         raise HTTPException(
             status_code=500, detail=f"An unexpected error occurred: {str(e)}"
         )
-    finally:
-        # Geçici dosyaları temizle
-        if input_path:
-            cleanup_file(input_path)
 
 
 @app.get("/download/{file_id}")
-async def download_depth_map(file_id: str):
+async def download_depth_map(request: Request, file_id: str):
     """
     Oluşturulan derinlik haritasını indir
     """
     output_filename = f"output_{file_id}.png"
     output_path = os.path.join(OUTPUT_FOLDER, output_filename)
 
-    if not os.path.exists(output_path):
-        raise HTTPException(status_code=404, detail="File not found")
-
-    return FileResponse(
-        path=output_path, filename=f"depth_map_{file_id}.png", media_type="image/png"
+    return await cached_file_response(
+        request,
+        output_path,
+        etag=file_id,
+        filename=f"depth_map_{file_id}.png",
+        media_type="image/png",
+        not_found_detail="File not found",
     )
 
 
 @app.get("/download/{file_id}/raw")
-async def download_raw_data(file_id: str):
+async def download_raw_data(
+    request: Request, file_id: str, precision: Literal["half", "full"] = "half"
+):
     """
-    Ham derinlik verilerini indir (.npy)
+    Ham derinlik verilerini indir (.npz, "depth" dizisi)
     """
-    npy_filename = f"output_{file_id}_raw.npy"
-    npy_path = os.path.join(OUTPUT_FOLDER, npy_filename)
-
-    if not os.path.exists(npy_path):
-        raise HTTPException(status_code=404, detail="Raw data file not found")
-
-    return FileResponse(
-        path=npy_path,
-        filename=f"depth_data_{file_id}.npy",
+    output_path = os.path.join(OUTPUT_FOLDER, f"output_{file_id}.png")
+    raw_path = raw_output_path(output_path, precision == "full")
+
+    return await cached_file_response(
+        request,
+        raw_path,
+        etag=f"{file_id}-{precision}",
+        filename=f"depth_data_{file_id}.npz",
         media_type="application/octet-stream",
+        not_found_detail="Raw data file not found",
     )
 
 
+@app.get("/imgbb/{file_id}")
+async def imgbb_status(file_id: str):
+    """
+    Arka plandaki ImgBB yüklemesinin durumunu getir
+    """
+    upload_record = imgbb_uploads.get(file_id)
+    if upload_record is None:
+        raise HTTPException(status_code=404, detail="No ImgBB upload for this file")
+
+    return {"file_id": file_id, **upload_record}
+
+
 @app.delete("/cleanup/{file_id}")
 async def cleanup_files(file_id: str):
     """
@@ -205,17 +514,18 @@ async def cleanup_files(file_id: str):
     """
     files_deleted = 0
 
-    # PNG dosyasını sil
+    # PNG ve ham veri dosyalarını sil
     png_path = os.path.join(OUTPUT_FOLDER, f"output_{file_id}.png")
-    if os.path.exists(png_path):
-        cleanup_file(png_path)
-        files_deleted += 1
+    paths = [png_path] + [
+        raw_output_path(png_path, full_precision) for full_precision in (False, True)
+    ]
 
-    # NPY dosyasını sil
-    npy_path = os.path.join(OUTPUT_FOLDER, f"output_{file_id}_raw.npy")
-    if os.path.exists(npy_path):
-        cleanup_file(npy_path)
-        files_deleted += 1
+    for path in paths:
+        if await output_exists(path):
+            await run_fs(cleanup_file, path)
+            files_deleted += 1
+
+    imgbb_uploads.pop(file_id, None)
 
     return {
         "success": True,
@@ -224,19 +534,27 @@ async def cleanup_files(file_id: str):
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """
     Sistem sağlık kontrolü
     """
+    output_folder_exists = await run_fs(os.path.exists, OUTPUT_FOLDER)
+
     return {
         "status": "healthy",
-        "model_loaded": depth_estimator is not None,
-        "temp_folder_exists": os.path.exists(TEMP_FOLDER),
-        "output_folder_exists": os.path.exists(OUTPUT_FOLDER),
+        "model_loaded": request.app.state.model is not None,
+        "output_folder_exists": output_folder_exists,
     }
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Her işçi süreci modelin kendi kopyasını yükler; GPU başına tek işçi önerilir
+    uvicorn.run(
+        "api:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("MODEL_WORKERS", "1")),
+        limit_concurrency=LIMIT_CONCURRENCY,
+    )
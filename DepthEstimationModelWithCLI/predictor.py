@@ -1,27 +1,141 @@
+import math
+import os
+import queue
+import uuid
 import warnings
+from contextlib import contextmanager
 
-import matplotlib.pyplot as plt
 import numpy as np
 import torch
 from PIL import Image
 
 warnings.filterwarnings("ignore", category=FutureWarning)
 
+INPUT_SIZE = (384, 384)
+CUDA_STREAMS = 2
+
+# ToTensor's 1/255 scaling and ImageNet Normalize folded into one multiply-add
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+NORMALIZE_SCALE = 1.0 / (255.0 * IMAGENET_STD)
+NORMALIZE_BIAS = -IMAGENET_MEAN / IMAGENET_STD
+
+# matplotlib's 256-entry plasma colormap as uint8 RGB, exported once with
+# plt.cm.plasma(np.arange(256), bytes=True)[:, :3]
+PLASMA_LUT = np.load(os.path.join(os.path.dirname(__file__), "plasma_lut.npy"))
+
+
+def raw_output_path(output_path, full_precision=False):
+    suffix = "_raw_full.npz" if full_precision else "_raw.npz"
+    return os.path.splitext(output_path)[0] + suffix
+
+
+@contextmanager
+def atomic_write_path(path):
+    # Write to a temp file next to the target and move it into place, so
+    # readers never see a partially written output
+    root, ext = os.path.splitext(path)
+    temp_path = f"{root}.{uuid.uuid4().hex}.tmp{ext}"
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
 
 def colorize(depth_map):
-    depth_norm = (depth_map - depth_map.min()) / (depth_map.max() - depth_map.min())
-    colored = plt.cm.plasma(depth_norm)
-    colored = (colored[:, :, :3] * 255).astype(np.uint8)
-    return colored
+    depth_range = np.ptp(depth_map)
+    if depth_range == 0:
+        return np.broadcast_to(PLASMA_LUT[0], (*depth_map.shape, 3)).copy()
+
+    scaled = (depth_map - depth_map.min()) * (256.0 / depth_range)
+    np.minimum(scaled, 255, out=scaled)
+    return PLASMA_LUT[scaled.astype(np.uint8)]
+
+
+class CudaStagingSlot:
+    """Pinned host / device buffers bound to their own CUDA stream."""
+
+    def __init__(self, numel, max_numel):
+        self.stream = torch.cuda.Stream()
+        self.max_numel = max(numel, max_numel)
+        self.host_buffer = None
+        self.device_buffer = None
+        self.ensure_capacity(numel)
+
+    def ensure_capacity(self, numel):
+        if self.host_buffer is not None and self.host_buffer.numel() >= numel:
+            return
+
+        self.host_buffer = torch.empty(numel, pin_memory=True)
+        self.device_buffer = torch.empty(numel, device="cuda")
+
+    def stage(self, tensors):
+        shape = (len(tensors), *tensors[0].shape)
+        numel = math.prod(shape)
+
+        if numel > self.max_numel:
+            # Oversized batches (e.g. ZoeDepth at the upload's resolution) skip
+            # pinning: the caching host allocator would keep that memory pinned
+            # for the life of the process
+            return torch.stack(tensors).to("cuda")
+
+        self.ensure_capacity(numel)
+        host = self.host_buffer[:numel].view(shape)
+        torch.stack(tensors, out=host)
+
+        device = self.device_buffer[:numel].view(shape)
+        device.copy_(host, non_blocking=True)
+        return device
 
 
 class DepthEstimationModel:
-    def __init__(self):
+    def __init__(self, compile_model=False, max_batch_size=1):
         self.model = self._initialize_model().to(self._get_device())
+        self.autocast_dtype = self._get_autocast_dtype()
+        self.max_batch_size = max_batch_size
+
+        # One staging slot per stream so copies of one batch overlap compute
+        # of another; each slot's buffers are reused and grown on demand up
+        # to a full batch of INPUT_SIZE images
+        self._staging_slots = queue.Queue()
+        if self._get_device() == "cuda":
+            image_numel = 3 * INPUT_SIZE[0] * INPUT_SIZE[1]
+            for _ in range(CUDA_STREAMS):
+                self._staging_slots.put(
+                    CudaStagingSlot(image_numel, max_batch_size * image_numel)
+                )
+
+        # Let cuDNN autotune convolutions when every input has the same shape
+        torch.backends.cudnn.benchmark = not hasattr(self.model, "infer")
+
+        if compile_model:
+            self._compile_model()
+
+    @property
+    def max_concurrent_batches(self):
+        return CUDA_STREAMS if self._get_device() == "cuda" else 1
+
+    @property
+    def model_id(self):
+        precision = str(self.autocast_dtype or torch.float32).replace("torch.", "")
+        return (
+            f"{type(self.model).__name__}-{INPUT_SIZE[0]}x{INPUT_SIZE[1]}-{precision}"
+        )
 
     def _get_device(self):
         return "cuda" if torch.cuda.is_available() else "cpu"
 
+    def _get_autocast_dtype(self):
+        if not torch.cuda.is_available():
+            return None
+        # is_bf16_supported() also reports emulated bf16 on pre-Ampere GPUs,
+        # which is far slower than native fp16 there
+        major, _ = torch.cuda.get_device_capability()
+        return torch.bfloat16 if major >= 8 else torch.float16
+
     def _initialize_model(self):
         try:
             torch.hub._get_cache_dir()
@@ -44,6 +158,32 @@ class DepthEstimationModel:
             print(f"ZoeD_N failed, trying alternative approach: {e}")
             return self._initialize_alternative_model()
 
+    def _compile_model(self):
+        if self._get_device() != "cuda" or not hasattr(torch, "compile"):
+            return
+
+        original_forward = self.model.forward
+        try:
+            # Compile forward in place so ZoeDepth's infer() also goes through it.
+            # No "reduce-overhead": its CUDA graphs are recorded per thread, and
+            # infer_batch runs on several executor threads
+            self.model.forward = torch.compile(original_forward)
+
+            # MiDaS always sees INPUT_SIZE, so warm up every batch size the API
+            # may send. ZoeDepth runs at the upload's resolution; one pass only
+            # checks that compilation works
+            sample = torch.zeros(3, *INPUT_SIZE)
+            max_warmup_batch = (
+                1 if hasattr(self.model, "infer") else self.max_batch_size
+            )
+            for batch_size in range(1, max_warmup_batch + 1):
+                self.infer_batch([sample] * batch_size)
+            print("Model compiled successfully.")
+
+        except Exception as e:
+            self.model.forward = original_forward
+            print(f"Model compilation failed, running eagerly: {e}")
+
     def _fix_model_state_dict(self, model):
         try:
             state_dict = model.state_dict()
@@ -73,55 +213,100 @@ class DepthEstimationModel:
             raise RuntimeError("Could not initialize any depth estimation model")
 
     def save_colored_depth(self, depth_numpy, output_path):
-        try:
-            colored = colorize(depth_numpy)
-            Image.fromarray(colored).save(output_path)
-            print(f"Colored depth image saved to {output_path}")
-        except Exception as e:
-            print(f"Error saving colored depth: {e}")
+        colored = colorize(depth_numpy)
+        with atomic_write_path(output_path) as temp_path:
+            # Low zlib effort: encoding dominates at higher levels for little size gain
+            Image.fromarray(colored).save(temp_path, compress_level=1)
+        print(f"Colored depth image saved to {output_path}")
+
+    def save_depthmap(
+        self, depth_numpy, output_path, save_raw=True, full_precision=False
+    ):
+        # Raw data first: an existing image then implies its raw data is complete
+        if save_raw:
+            # float16 keeps ~3 significant digits, plenty for depth in meters
+            raw_path = raw_output_path(output_path, full_precision)
+            dtype = np.float32 if full_precision else np.float16
+            with atomic_write_path(raw_path) as temp_path:
+                np.savez_compressed(temp_path, depth=depth_numpy.astype(dtype))
+            print(f"Raw depth data saved to {raw_path}")
+
+        self.save_colored_depth(depth_numpy, output_path)
+
+        return f"Depth map saved to {output_path}"
 
     def calculate_depthmap(self, image_path, output_path):
         try:
-            image = Image.open(image_path).convert("RGB")
+            image = self.load_image(image_path)
             print("Image loaded successfully.")
 
-            if hasattr(self.model, "infer_pil"):
-                depth_numpy = self.model.infer_pil(image)
-            else:
-                depth_numpy = self._infer_midas(image)
-
-            self.save_colored_depth(depth_numpy, output_path)
+            depth_numpy = self.infer_image(image)
 
-            raw_output_path = output_path.replace(".png", "_raw.npy")
-            np.save(raw_output_path, depth_numpy)
-            print(f"Raw depth data saved to {raw_output_path}")
-
-            return f"Depth map saved to {output_path}"
+            return self.save_depthmap(depth_numpy, output_path)
 
         except Exception as e:
             print(f"Error in depth calculation: {e}")
             return None
 
-    def _infer_midas(self, image):
-        import torchvision.transforms as transforms
+    def load_image(self, source):
+        # Accepts a path or an open binary file object
+        return Image.open(source).convert("RGB")
 
-        transform = transforms.Compose(
-            [
-                transforms.Resize((384, 384)),
-                transforms.ToTensor(),
-                transforms.Normalize(
-                    mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]
-                ),
-            ]
-        )
+    def preprocess(self, image):
+        if hasattr(self.model, "infer"):
+            # ZoeDepth normalizes internally and works at the input resolution
+            pixels = np.asarray(image, dtype=np.float32)
+            pixels *= 1.0 / 255.0
+        else:
+            image = image.resize(
+                (INPUT_SIZE[1], INPUT_SIZE[0]), Image.Resampling.BILINEAR
+            )
+            pixels = np.asarray(image, dtype=np.float32)
+            pixels *= NORMALIZE_SCALE
+            pixels += NORMALIZE_BIAS
+
+        return torch.from_numpy(pixels).permute(2, 0, 1)
+
+    def infer_tensor(self, input_tensor):
+        return self._forward(input_tensor.to(self._get_device())).cpu()
+
+    def _forward(self, input_tensor):
+        with torch.inference_mode(), torch.autocast(
+            device_type="cuda",
+            dtype=self.autocast_dtype,
+            enabled=self.autocast_dtype is not None,
+        ):
+            if hasattr(self.model, "infer"):
+                depth = self.model.infer(input_tensor)
+            else:
+                depth = self.model(input_tensor)
+
+        # ZoeDepth returns (N, 1, H, W), MiDaS returns (N, H, W)
+        depth = depth.reshape(depth.shape[0], *depth.shape[-2:])
+        return depth.float()
 
-        input_tensor = transform(image).unsqueeze(0).to(self._get_device())
+    def infer_batch(self, tensors):
+        if self._get_device() != "cuda":
+            depth = self.infer_tensor(torch.stack(tensors))
+            return [d.numpy() for d in depth]
 
-        with torch.no_grad():
-            depth = self.model(input_tensor)
-            depth = depth.squeeze().cpu().numpy()
+        # Blocks until a slot is free, so at most CUDA_STREAMS batches in flight
+        slot = self._staging_slots.get()
+        try:
+            with torch.cuda.stream(slot.stream):
+                depth = self._forward(slot.stage(tensors))
+                # Lands in pinned memory, so the copy is asynchronous too
+                depth = depth.to("cpu", non_blocking=True)
+            slot.stream.synchronize()
+        finally:
+            self._staging_slots.put(slot)
 
-        return depth
+        # Copy out of pinned memory so callers holding results until they are
+        # saved don't keep pinned blocks alive
+        return [d.numpy().copy() for d in depth]
+
+    def infer_image(self, image):
+        return self.infer_batch([self.preprocess(image)])[0]
 
 
 if __name__ == "__main__":
@@ -129,8 +314,6 @@ if __name__ == "__main__":
         print("Initializing Depth Estimation Model...")
         model = DepthEstimationModel()
 
-        import os
-
         if not os.path.exists("./test.png"):
             print(
                 "Warning: test.png not found. Please make sure the image file exists."
@@ -1,8 +1,34 @@
 import base64
+import mimetypes
 import os
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+IMGBB_UPLOAD_URL = "https://api.imgbb.com/1/upload"
+UPLOAD_TIMEOUT = 30  # saniye
+MAX_UPLOAD_SIZE = 32 * 1024 * 1024  # ImgBB limiti: 32MB
+
+
+def _create_session():
+    """Create a pooled session that keeps connections to ImgBB alive."""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=16, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = _create_session()
 
 
 def get_api_key():
@@ -14,6 +40,28 @@ def get_api_key():
     return api_key
 
 
+def _parse_upload_response(response):
+    """Return the image URL from an ImgBB response or raise on failure."""
+    try:
+        response_data = response.json()
+    except ValueError:
+        response_data = None
+
+    # Success kontrolü
+    if response_data and response_data.get("success", False):
+        return response_data["data"]["url"]
+
+    # ImgBB'nin bildirdiği hatalar (ör. geçersiz anahtar) yeniden denenmez
+    if response_data and "error" in response_data:
+        error_msg = response_data["error"].get("message", "Unknown error")
+        error_code = response_data["error"].get("code", "Unknown code")
+        raise Exception(f"ImgBB API Error [{error_code}]: {error_msg}")
+
+    # HTTP status kontrolü (requests.HTTPError fırlatır)
+    response.raise_for_status()
+    raise Exception(f"Upload failed: {response_data or response.text}")
+
+
 def upload_image(image_path):
     """
     Upload an image to the ImgBB service.
@@ -27,98 +75,55 @@ def upload_image(image_path):
     if not os.path.exists(image_path):
         raise FileNotFoundError(f"Image file not found: {image_path}")
 
+    # Dosyayı açmadan önce boyut kontrolü
+    size = os.path.getsize(image_path)
+    if size > MAX_UPLOAD_SIZE:
+        raise ValueError(
+            f"Image too large for ImgBB: {size} bytes (max {MAX_UPLOAD_SIZE})"
+        )
+
     api_key = get_api_key()
-    url = "https://api.imgbb.com/1/upload"
+    url = IMGBB_UPLOAD_URL
 
-    # METHOD 1: Base64 encoding (ImgBB'nin tercih ettiği yöntem)
+    # METHOD 1: Multipart form data (dosya olduğu gibi, ek kodlama olmadan)
     try:
         with open(image_path, "rb") as image_file:
-            # Dosyayı base64'e encode et
-            image_data = base64.b64encode(image_file.read()).decode("utf-8")
-
-        # Form data olarak gönder
-        payload = {
-            "key": api_key,
-            "image": image_data,
-        }
-
-        response = requests.post(url, data=payload)
-
-        # HTTP status kontrolü
-        if response.status_code != 200:
-            raise Exception(f"HTTP Error {response.status_code}: {response.text}")
+            # Files parameter ile gönder (multipart/form-data)
+            content_type = mimetypes.guess_type(image_path)[0] or "image/png"
+            files = {"image": (os.path.basename(image_path), image_file, content_type)}
+            data = {"key": api_key}
 
-        response_data = response.json()
+            response = _SESSION.post(
+                url, files=files, data=data, timeout=UPLOAD_TIMEOUT
+            )
 
-        # Success kontrolü
-        if response_data.get("success", False):
-            return response_data["data"]["url"]
-        else:
-            # Hata mesajını al
-            if "error" in response_data:
-                error_msg = response_data["error"].get("message", "Unknown error")
-                error_code = response_data["error"].get("code", "Unknown code")
-                raise Exception(f"ImgBB API Error [{error_code}]: {error_msg}")
-            else:
-                raise Exception(f"Upload failed: {response_data}")
+        return _parse_upload_response(response)
 
     except requests.exceptions.RequestException as e:
-        raise Exception(f"Network error: {str(e)}")
-    except Exception as e:
-        # Eğer base64 method çalışmazsa, multipart dene
-        return upload_image_multipart_fallback(image_path)
+        # Multipart istek başarısız olursa base64 dene
+        print(f"Multipart upload failed, trying base64: {e}")
+        return upload_image_base64_fallback(image_path)
 
 
-def upload_image_multipart_fallback(image_path):
-    """Fallback method using multipart form data"""
+def upload_image_base64_fallback(image_path):
+    """Fallback method using a base64 encoded form field"""
     api_key = get_api_key()
-    url = "https://api.imgbb.com/1/upload"
+    url = IMGBB_UPLOAD_URL
 
     try:
         with open(image_path, "rb") as image_file:
-            # Files parameter ile gönder (multipart/form-data)
-            files = {"image": (os.path.basename(image_path), image_file, "image/jpeg")}
-            data = {"key": api_key}
-
-            response = requests.post(url, files=files, data=data)
+            # Dosyayı base64'e encode et
+            image_data = base64.b64encode(image_file.read()).decode("utf-8")
 
-            if response.status_code != 200:
-                raise Exception(f"HTTP Error {response.status_code}: {response.text}")
+        # Form data olarak gönder
+        payload = {
+            "key": api_key,
+            "image": image_data,
+        }
 
-            response_data = response.json()
+        response = _SESSION.post(url, data=payload, timeout=UPLOAD_TIMEOUT)
 
-            if response_data.get("success", False):
-                return response_data["data"]["url"]
-            else:
-                if "error" in response_data:
-                    error_msg = response_data["error"].get("message", "Unknown error")
-                    raise Exception(f"ImgBB API Error: {error_msg}")
-                else:
-                    raise Exception(f"Upload failed: {response_data}")
+        return _parse_upload_response(response)
 
     except Exception as e:
         raise Exception(f"Both upload methods failed: {str(e)}")
-
-
-# Test fonksiyonu
-def test_upload_with_detailed_info(image_path):
-    """Test upload with detailed debugging"""
-    print(f"Testing upload for: {image_path}")
-    print(f"File exists: {os.path.exists(image_path)}")
-
-    if os.path.exists(image_path):
-        print(f"File size: {os.path.getsize(image_path)} bytes")
-
-    try:
-        api_key = get_api_key()
-        print(f"API Key loaded: {'Yes' if api_key else 'No'}")
-        print(f"API Key length: {len(api_key) if api_key else 0}")
-
-        result = upload_image(image_path)
-        print(f"Upload successful!")
-        print(f"Image URL: {result}")
-        return result
-
-    except Exception as e:
-        print(f"Upload failed: {str(e)}")
-        return None